@@ -4,8 +4,14 @@ import tkinter as tk
 from tkinter import ttk, font, messagebox
 import banidb
 import sys
+import os
+import json
+import time
 import signal
+import sqlite3
 import logging
+import threading
+from datetime import date, datetime, timedelta
 from typing import Dict, Any
 
 # Configure logging
@@ -18,6 +24,407 @@ logging.basicConfig(
     ]
 )
 
+SOURCES = {
+    'G': ("Sri Guru Granth Sahib Ji", 1430),
+    'D': ("Dasam Granth Sahib", 1428),
+    'B': ("Vaaran Bhai Gurdas Ji", 40)
+}
+
+def extract_verses(shabad_data):
+    """Turn a banidb shabad into display-ready verse dicts"""
+    verses = []
+    for verse_data in shabad_data.get('verses', []):
+        # Get Gurmukhi text
+        gurmukhi = str(verse_data.get('verse', '')).strip()
+        
+        # Get English transliteration
+        transliteration = ""
+        if 'transliteration' in verse_data:
+            if isinstance(verse_data['transliteration'], dict):
+                transliteration = str(verse_data['transliteration'].get('en', '')).strip()
+            else:
+                transliteration = str(verse_data['transliteration']).strip()
+        
+        # Get English translation
+        translation = ""
+        if 'steek' in verse_data and 'en' in verse_data['steek']:
+            translation = str(verse_data['steek']['en'].get('bdb', '')).strip()
+        
+        if gurmukhi and transliteration and translation:
+            verses.append({
+                'gurmukhi': gurmukhi,
+                'transliteration': transliteration,
+                'translation': translation
+            })
+    return verses
+
+def seconds_until(clock, now):
+    """Seconds from now until the next occurrence of an HH:MM clock time"""
+    hour, minute = (int(part) for part in clock.split(':'))
+    target = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if target <= now:
+        target += timedelta(days=1)
+    return (target - now).total_seconds()
+
+def fetch_page_verses(source, page_no, source_id='G'):
+    """Fetch one page of a source and build its display-ready verses.
+    
+    Returns (verses, complete), where complete is False if any shabad on
+    the page could not be fetched.
+    """
+    page_data = source.angs(page_no, source_id)
+    if not page_data or ('page' not in page_data and 'pages' not in page_data):
+        raise Exception(f"No data found for page {page_no} of source {source_id}")
+    
+    # Some sources split a page number across several pages
+    if 'page' in page_data:
+        lines = page_data['page']
+    else:
+        lines = [line for page in page_data['pages'] for line in page.get('page', [])]
+    
+    verses = []
+    complete = True
+    seen_shabads = set()
+    for verse in lines:
+        try:
+            if 'shabad_id' not in verse:
+                logging.warning(f"Missing shabad_id in verse: {verse}")
+                continue
+            
+            # Each line of a shabad has the same shabad_id; show its verses once
+            if verse['shabad_id'] in seen_shabads:
+                continue
+            seen_shabads.add(verse['shabad_id'])
+                
+            # Get the shabad data for translation
+            shabad_data = source.shabad(verse['shabad_id'])
+            
+            if not shabad_data:
+                logging.warning(f"No shabad data found for shabad_id: {verse['shabad_id']}")
+                complete = False
+                continue
+            
+            # Get the transliteration and translation for each line
+            verses.extend(extract_verses(shabad_data))
+        except Exception as e:
+            logging.error(f"Error processing verse: {str(e)}")
+            complete = False
+            continue
+    
+    if not verses:
+        raise Exception(f"No valid verses found in page {page_no} of source {source_id}")
+    return verses, complete
+
+class CorpusShard:
+    """Local store for one scripture source, kept in its own SQLite file.
+    
+    The shard holds the source's page count and its pages, indexed by page
+    number. The connection is only opened on first use.
+    """
+    
+    def __init__(self, path, page_count):
+        self.path = path
+        self.default_page_count = page_count
+        self.conn = None
+        self.page_count = None
+        self.last_used = 0
+        
+    def open(self):
+        if self.conn is None:
+            self.conn = sqlite3.connect(self.path)
+            self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            self.conn.execute("CREATE TABLE IF NOT EXISTS pages (page_no INTEGER PRIMARY KEY, verses TEXT)")
+            self.conn.execute(
+                "INSERT OR IGNORE INTO meta VALUES ('page_count', ?)",
+                (str(self.default_page_count),)
+            )
+            self.conn.commit()
+            self.page_count = int(self.conn.execute(
+                "SELECT value FROM meta WHERE key = 'page_count'"
+            ).fetchone()[0])
+        self.last_used = time.monotonic()
+        return self
+        
+    def page(self, page_no):
+        row = self.conn.execute("SELECT verses FROM pages WHERE page_no = ?", (page_no,)).fetchone()
+        return json.loads(row[0]) if row else None
+        
+    def store_page(self, page_no, verses):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO pages VALUES (?, ?)",
+            (page_no, json.dumps(verses, ensure_ascii=False))
+        )
+        self.conn.commit()
+        
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+class CorpusStore:
+    """Scripture storage sharded by source, one lazily opened shard per source"""
+    
+    def __init__(self, directory, source, idle_timeout=600):
+        self.directory = directory
+        self.source = source
+        self.idle_timeout = idle_timeout
+        self.shards = {}
+        os.makedirs(directory, exist_ok=True)
+        
+    def shard(self, source_id):
+        if source_id not in SOURCES:
+            raise ValueError(f"Unknown source {source_id}")
+        if source_id not in self.shards:
+            self.shards[source_id] = CorpusShard(
+                os.path.join(self.directory, f"{source_id}.db"),
+                SOURCES[source_id][1]
+            )
+        shard = self.shards[source_id]
+        self.close_idle()
+        if shard.conn is None:
+            logging.info(f"Opening shard for {SOURCES[source_id][0]}")
+        return shard.open()
+        
+    def page_count(self, source_id):
+        return self.shard(source_id).page_count
+        
+    def page(self, source_id, page_no):
+        """Return a page's verses, fetching and storing it on first use"""
+        shard = self.shard(source_id)
+        if not 0 < page_no <= shard.page_count:
+            raise ValueError(f"Page {page_no} does not exist in source {source_id}")
+        verses = shard.page(page_no)
+        if verses is None:
+            verses, complete = fetch_page_verses(self.source, page_no, source_id)
+            # Partly fetched pages are shown but fetched again next time
+            if complete:
+                shard.store_page(page_no, verses)
+            else:
+                logging.warning(f"Not storing incomplete page {page_no} of source {source_id}")
+        return verses
+        
+    def close_idle(self, now=None):
+        now = now or time.monotonic()
+        for source_id, shard in self.shards.items():
+            if shard.conn is not None and now - shard.last_used > self.idle_timeout:
+                logging.info(f"Closing idle shard for {SOURCES[source_id][0]}")
+                shard.close()
+                
+    def close(self):
+        for shard in self.shards.values():
+            shard.close()
+
+def in_time_window(start, end, now):
+    """Whether now falls in the HH:MM window start-end, which may wrap past midnight"""
+    start_time = datetime.strptime(start, '%H:%M').time()
+    end_time = datetime.strptime(end, '%H:%M').time()
+    if start_time <= end_time:
+        return start_time <= now.time() < end_time
+    return now.time() >= start_time or now.time() < end_time
+
+POWER_REPORT_INTERVAL = 10 * 60
+
+class PowerMonitor:
+    """Tracks CPU usage and wakeups so display modes can be compared"""
+    
+    def __init__(self, mode):
+        self.mode = mode
+        self.reset()
+        
+    def reset(self):
+        self.wakeups = 0
+        self.started = time.monotonic()
+        self.cpu_started = time.process_time()
+        
+    def wakeup(self):
+        self.wakeups += 1
+        
+    def report_due(self):
+        return time.monotonic() - self.started >= POWER_REPORT_INTERVAL
+        
+    def stats(self):
+        """Average CPU% and wakeups per minute since the last reset"""
+        elapsed = max(time.monotonic() - self.started, 1e-6)
+        cpu_percent = (time.process_time() - self.cpu_started) / elapsed * 100
+        return cpu_percent, self.wakeups / elapsed * 60
+        
+    def report(self):
+        cpu_percent, wakeups_per_minute = self.stats()
+        logging.info(
+            f"Power ({self.mode} mode): CPU {cpu_percent:.1f}%, "
+            f"{wakeups_per_minute:.1f} wakeups/min"
+        )
+        self.reset()
+
+class LocalSource:
+    """Stand-in for the banidb module that serves data from a JSON file.
+    
+    The file mirrors what banidb returns:
+    {"angs": {"G": {"1": ...}}, "shabads": {"1": ...}, "hukamnamas": {"2025-05-02": ...}}
+    """
+    
+    def __init__(self, path):
+        with open(path, encoding='utf-8') as f:
+            self.data = json.load(f)
+        
+    def angs(self, ang_no, source_id='G'):
+        return self.data.get('angs', {}).get(source_id, {}).get(str(ang_no))
+        
+    def shabad(self, shabad_id):
+        return self.data.get('shabads', {}).get(str(shabad_id))
+        
+    def hukamnama(self, year, month, day):
+        return self.data.get('hukamnamas', {}).get(f"{year:04d}-{month:02d}-{day:02d}")
+
+class LockedSource:
+    """Serializes calls into a data source shared by the Tk and preload threads.
+    
+    banidb's cache re-reads and rewrites cache.dat on every lookup without
+    any locking, so concurrent calls can see a truncated file.
+    """
+    
+    def __init__(self, source):
+        self.source = source
+        self.lock = threading.Lock()
+        
+    def angs(self, *args, **kwargs):
+        with self.lock:
+            return self.source.angs(*args, **kwargs)
+        
+    def shabad(self, *args, **kwargs):
+        with self.lock:
+            return self.source.shabad(*args, **kwargs)
+        
+    def hukamnama(self, *args, **kwargs):
+        with self.lock:
+            return self.source.hukamnama(*args, **kwargs)
+
+def create_source():
+    """Use the local stand-in source if one is configured, banidb otherwise"""
+    path = os.environ.get('GURBANI_LOCAL_SOURCE')
+    if path:
+        logging.info(f"Using local source {path}")
+        return LockedSource(LocalSource(path))
+    return LockedSource(banidb)
+
+BOOT_REFRESH_TIME = '00:01'
+
+class HukamnamaScheduler:
+    """Resolves and lays out the day's Hukamnama ahead of program time.
+    
+    preload_at is either 'boot' or an HH:MM clock time. With a clock time the
+    preload runs daily, and also at startup if that time has already passed.
+    In boot mode it runs at startup and again daily at BOOT_REFRESH_TIME.
+    """
+    
+    def __init__(self, root, source, preload_at='boot'):
+        self.root = root
+        self.source = source
+        self.preload_at = preload_at
+        self.clock = None
+        self.timer = None
+        self.lock = threading.Lock()
+        self.preloaded = None
+        self.last_lead_time = None
+        self.last_served_from_memory = None
+        
+    def start(self):
+        now = datetime.now()
+        preload_now = True
+        self.clock = BOOT_REFRESH_TIME
+        if self.preload_at != 'boot':
+            try:
+                delay = seconds_until(self.preload_at, now)
+                self.clock = self.preload_at
+                # Only preload now if today's time has already passed
+                preload_now = (now + timedelta(seconds=delay)).date() > now.date()
+            except ValueError:
+                logging.error(f"Invalid Hukamnama preload time {self.preload_at!r}, preloading at boot")
+        
+        if preload_now:
+            self.preload_async()
+        delay = seconds_until(self.clock, now)
+        self.timer = self.root.after(int(delay * 1000), self.run_scheduled)
+        logging.info(f"Hukamnama preload scheduled in {delay:.0f}s")
+        
+    def run_scheduled(self):
+        self.preload_async()
+        self.timer = self.root.after(
+            int(seconds_until(self.clock, datetime.now()) * 1000),
+            self.run_scheduled
+        )
+        
+    def preload_async(self):
+        threading.Thread(target=self.preload, daemon=True).start()
+        
+    def fetch(self, today=None):
+        """Fetch today's Hukamnama and build its verses; raises if unavailable"""
+        today = today or date.today()
+        
+        # banidb binds its default date at import time, so always pass it
+        hukam = self.source.hukamnama(today.year, today.month, today.day)
+        if not isinstance(hukam, dict) or not hukam.get('hukam'):
+            raise Exception(f"No Hukamnama found for {today}")
+        
+        verses = []
+        for shabad_data in hukam['hukam']:
+            verses.extend(extract_verses(shabad_data))
+        if not verses:
+            raise Exception(f"No valid verses in Hukamnama for {today}")
+        
+        return {
+            'date': today,
+            'ang': hukam['hukam'][0].get('ang', 1),
+            'verses': verses,
+            'finished_at': time.time()
+        }
+        
+    def preload(self, today=None):
+        """Fetch and keep today's Hukamnama; returns the entry or None"""
+        started = time.monotonic()
+        try:
+            entry = self.fetch(today)
+            with self.lock:
+                self.preloaded = entry
+            logging.info(
+                f"Preloaded Hukamnama for {entry['date']} (Ang {entry['ang']}, "
+                f"{len(entry['verses'])} lines) in {time.monotonic() - started:.1f}s"
+            )
+            return entry
+        except Exception as e:
+            logging.error(f"Error preloading Hukamnama: {str(e)}")
+            return None
+            
+    def fetch_live(self, today=None):
+        """Fetch today's Hukamnama at program time, without keeping it as a preload"""
+        started = time.monotonic()
+        entry = self.fetch(today)
+        logging.info(f"Fetched Hukamnama live in {time.monotonic() - started:.1f}s")
+        return entry
+        
+    def take(self, today=None):
+        """Return today's preloaded Hukamnama, recording how early it was ready"""
+        today = today or date.today()
+        with self.lock:
+            entry = self.preloaded
+        if entry and entry['date'] == today:
+            self.last_served_from_memory = True
+            self.last_lead_time = time.time() - entry['finished_at']
+            logging.info(f"Hukamnama served from memory, preloaded {self.last_lead_time:.0f}s ahead")
+            return entry
+        self.last_served_from_memory = False
+        self.last_lead_time = None
+        logging.info("Hukamnama not preloaded for today, loading live")
+        return None
+        
+    def cancel(self):
+        if self.timer:
+            self.root.after_cancel(self.timer)
+            self.timer = None
+
+HOUSEKEEPING_INTERVAL = 60 * 1000
+BLANK_IDLE_TIMEOUT = 30 * 60
+
 class GurbaniViewer:
     def __init__(self, root):
         self.root = root
@@ -33,16 +440,39 @@ class GurbaniViewer:
         self.root.bind('<Escape>', lambda e: self.cleanup())
         
         # Initialize state
+        self.current_source = 'G'
         self.current_ang = 1
-        self.total_angs = 1430
+        self.total_angs = SOURCES['G'][1]
         self.is_paused = False
         self.auto_switch_timer = None
         self.current_verse_index = 0
         self.current_ang_verses = []
         
+        # Low-power presentation state
+        self.low_power = os.environ.get('GURBANI_LOW_POWER') == '1'
+        self.blank_schedule = os.environ.get('GURBANI_BLANK_SCHEDULE')
+        self.blank_mode = os.environ.get('GURBANI_BLANK_MODE', 'blank')
+        self.shown_values = {}
+        self.menu_buttons = []
+        self.button_colors = {}
+        self.housekeeping_timer = None
+        self.is_blanked = False
+        self.last_activity = time.monotonic()
+        self.check_blank_settings()
+        self.power = PowerMonitor('low-power' if self.low_power else 'standard')
+        
+        # Data source, local corpus storage and Hukamnama preloading
+        self.source = create_source()
+        self.corpus = CorpusStore(os.environ.get('GURBANI_CORPUS_DIR', 'corpus'), self.source)
+        self.hukamnama = HukamnamaScheduler(
+            root,
+            self.source,
+            os.environ.get('GURBANI_HUKAMNAMA_PRELOAD', 'boot')
+        )
+        
         # Test banidb connection first
         try:
-            test_data = banidb.angs(1)
+            test_data = self.source.angs(1)
             if not test_data or 'page' not in test_data:
                 raise Exception("Invalid response from banidb")
             logging.info("Successfully connected to banidb")
@@ -111,6 +541,15 @@ class GurbaniViewer:
             # Start auto-switch
             self.start_auto_switch()
             
+            # Start Hukamnama preloading
+            self.hukamnama.start()
+            
+            # Start blank schedule checks, only needed when a schedule is set
+            if self.blank_schedule:
+                self.root.bind('<Key>', self.on_user_activity)
+                self.root.bind('<Button>', self.on_user_activity)
+                self.housekeeping_timer = self.schedule(HOUSEKEEPING_INTERVAL, self.housekeeping)
+            
             # Handle window close
             self.root.protocol("WM_DELETE_WINDOW", self.cleanup)
         except Exception as e:
@@ -123,6 +562,37 @@ class GurbaniViewer:
         menu_frame = ttk.Frame(self.main_frame, style='Menu.TFrame')
         menu_frame.pack(fill=tk.X, pady=(0, 30), padx=20)
         
+        # Kiosk layout: category buttons only, no label or nested frame
+        if self.low_power:
+            for category in self.bani_categories:
+                self.menu_buttons.append(tk.Button(
+                    menu_frame,
+                    text=category,
+                    font=('Arial', 14, 'bold'),
+                    bg='#3498db',
+                    fg='white',
+                    relief='flat',
+                    bd=0,
+                    padx=25,
+                    pady=12,
+                    command=lambda c=category: self.show_category_menu(c)
+                ))
+            self.menu_buttons.append(tk.Button(
+                menu_frame,
+                text="Sources",
+                font=('Arial', 14, 'bold'),
+                bg='#16a085',
+                fg='white',
+                relief='flat',
+                bd=0,
+                padx=25,
+                pady=12,
+                command=self.show_source_menu
+            ))
+            for button in self.menu_buttons:
+                button.pack(side=tk.LEFT, padx=10, pady=5)
+            return
+        
         # Create a label for the menu
         menu_label = tk.Label(
             menu_frame,
@@ -157,7 +627,78 @@ class GurbaniViewer:
                 command=lambda c=category: self.show_category_menu(c)
             )
             category_btn.pack(side=tk.LEFT, padx=10, pady=5)
+            self.menu_buttons.append(category_btn)
+            
+        # Create source selection button
+        source_btn = tk.Button(
+            category_frame,
+            text="Sources",
+            font=('Arial', 14, 'bold'),
+            bg='#16a085',
+            fg='white',
+            activebackground='#138d75',
+            activeforeground='white',
+            relief='flat',
+            bd=0,
+            padx=25,
+            pady=12,
+            cursor='hand2',
+            command=self.show_source_menu
+        )
+        source_btn.pack(side=tk.LEFT, padx=10, pady=5)
+        self.menu_buttons.append(source_btn)
             
+    def show_source_menu(self):
+        # Create popup menu
+        popup = tk.Toplevel(self.root)
+        popup.title("Sources")
+        popup.geometry("600x500")
+        popup.configure(bg='#f8f9fa')
+        
+        # Make popup modal
+        popup.transient(self.root)
+        popup.grab_set()
+        
+        source_frame = ttk.Frame(popup, style='Menu.TFrame')
+        source_frame.pack(expand=True, fill=tk.BOTH, padx=30, pady=30)
+        
+        # Add one button per source
+        for source_id, (name, page_count) in SOURCES.items():
+            source_btn = tk.Button(
+                source_frame,
+                text=f"{name} ({page_count} pages)",
+                font=('Arial', 14),
+                bg='#2980b9',
+                fg='white',
+                activebackground='#3498db',
+                activeforeground='white',
+                relief='flat',
+                bd=0,
+                padx=25,
+                pady=12,
+                cursor='hand2',
+                command=lambda s=source_id: (popup.destroy(), self.switch_source(s))
+            )
+            source_btn.pack(fill=tk.X, pady=8, padx=10)
+            
+        # Add close button
+        close_btn = tk.Button(
+            source_frame,
+            text="Close",
+            font=('Arial', 14),
+            bg='#e74c3c',
+            fg='white',
+            activebackground='#c0392b',
+            activeforeground='white',
+            relief='flat',
+            bd=0,
+            padx=25,
+            pady=12,
+            cursor='hand2',
+            command=popup.destroy
+        )
+        close_btn.pack(pady=(30, 0))
+        
     def show_category_menu(self, category):
         # Create popup menu
         popup = tk.Toplevel(self.root)
@@ -254,13 +795,20 @@ class GurbaniViewer:
         close_btn.pack(pady=(30, 0))
         
     def load_bani(self, bani_name):
+        self.on_user_activity()
+        
+        if bani_name == "Hukamnama":
+            self.load_hukamnama()
+            return
+            
         try:
             # Find the bani's ang range
             for category, banis in self.bani_categories.items():
                 if bani_name in banis:
                     start_ang, end_ang = banis[bani_name]
-                    self.current_ang = start_ang
-                    self.load_ang()
+                    # Fetch first so a failure leaves the current page in place
+                    verses = self.corpus.page('G', start_ang)
+                    self.show_page('G', start_ang, verses)
                     messagebox.showinfo("Info", f"Loaded {bani_name} (Ang {start_ang}-{end_ang})")
                     return
             
@@ -270,6 +818,23 @@ class GurbaniViewer:
             logging.error(f"Error loading bani {bani_name}: {str(e)}")
             messagebox.showerror("Error", f"Failed to load {bani_name}: {str(e)}")
             
+    def load_hukamnama(self):
+        try:
+            # Served from memory when preloaded, fetched live otherwise
+            hukam = self.hukamnama.take() or self.hukamnama.fetch_live()
+            
+            self.current_source = 'G'
+            self.total_angs = SOURCES['G'][1]
+            self.current_ang = hukam['ang']
+            self.update_widget('ang_label', self.page_title())
+            self.current_ang_verses = list(hukam['verses'])
+            self.current_verse_index = 0
+            self.display_current_verse()
+            
+        except Exception as e:
+            logging.error(f"Error loading Hukamnama: {str(e)}")
+            messagebox.showerror("Error", f"Failed to load Hukamnama: {str(e)}")
+            
     def create_header(self):
         header_frame = ttk.Frame(self.main_frame, style='Header.TFrame')
         header_frame.pack(fill=tk.X, pady=(0, 30))
@@ -291,6 +856,10 @@ class GurbaniViewer:
         self.verse_counter.pack(side=tk.RIGHT, padx=20)
         
     def create_footer(self):
+        # The kiosk layout shows progress through the line counter only
+        if self.low_power:
+            return
+            
         footer_frame = ttk.Frame(self.main_frame, style='Footer.TFrame')
         footer_frame.pack(fill=tk.X, pady=(30, 0))
         
@@ -359,8 +928,11 @@ class GurbaniViewer:
             self.verse_frame.pack(expand=True, fill=tk.BOTH, pady=10)
             
             # Create a container frame for better centering
-            container_frame = ttk.Frame(self.verse_frame, style='Main.TFrame')
-            container_frame.pack(expand=True, fill=tk.BOTH, padx=20)
+            if self.low_power:
+                container_frame = self.verse_frame
+            else:
+                container_frame = ttk.Frame(self.verse_frame, style='Main.TFrame')
+                container_frame.pack(expand=True, fill=tk.BOTH, padx=20)
             
             # Gurmukhi
             self.gurmukhi_label = ttk.Label(
@@ -406,13 +978,16 @@ class GurbaniViewer:
             control_frame.pack(fill=tk.X, pady=10)
             
             # Create buttons frame
-            button_frame = ttk.Frame(control_frame, style='Main.TFrame')
-            button_frame.pack(expand=True, anchor=tk.CENTER)
+            if self.low_power:
+                button_frame = control_frame
+            else:
+                button_frame = ttk.Frame(control_frame, style='Main.TFrame')
+                button_frame.pack(expand=True, anchor=tk.CENTER)
             
             # Previous button
             self.prev_button = tk.Button(
                 button_frame,
-                text="⏮️ Previous",
+                text=self.button_text("⏮️", "Previous"),
                 font=('Arial', 20, 'bold'),
                 bg='#ffffff',
                 fg='#000000',
@@ -430,7 +1005,7 @@ class GurbaniViewer:
             # Pause/Resume button
             self.pause_button = tk.Button(
                 button_frame,
-                text="⏸️ Pause",
+                text=self.button_text("⏸️", "Pause"),
                 font=('Arial', 20, 'bold'),
                 bg='#ffffff',
                 fg='#000000',
@@ -448,7 +1023,7 @@ class GurbaniViewer:
             # Next button
             self.next_button = tk.Button(
                 button_frame,
-                text="⏭️ Next",
+                text=self.button_text("⏭️", "Next"),
                 font=('Arial', 20, 'bold'),
                 bg='#ffffff',
                 fg='#000000',
@@ -467,73 +1042,57 @@ class GurbaniViewer:
             logging.error(f"Error creating controls: {str(e)}")
             raise
         
+    def button_text(self, emoji, label):
+        # Emoji need font fallback on every layout pass, so kiosk buttons use plain text
+        if self.low_power:
+            return label
+        return f"{emoji} {label}"
+        
     def load_ang(self):
         try:
-            logging.info(f"Loading ang {self.current_ang}")
-            ang_data = banidb.angs(self.current_ang)
-            
-            if not ang_data or 'page' not in ang_data:
-                raise Exception(f"No data found for ang {self.current_ang}")
+            logging.info(f"Loading {self.page_title()}")
+            verses = self.corpus.page(self.current_source, self.current_ang)
             
             # Update header
-            self.ang_label.config(text=f"Ang {self.current_ang}")
-            
-            # Clear current verses
-            self.current_ang_verses = []
-            
-            # Process each verse
-            for verse in ang_data['page']:
-                try:
-                    if 'shabad_id' not in verse:
-                        logging.warning(f"Missing shabad_id in verse: {verse}")
-                        continue
-                        
-                    # Get the shabad data for translation
-                    shabad_data = banidb.shabad(verse['shabad_id'])
-                    
-                    if not shabad_data:
-                        logging.warning(f"No shabad data found for shabad_id: {verse['shabad_id']}")
-                        continue
-                    
-                    # Get the transliteration and translation for each line
-                    if 'verses' in shabad_data:
-                        for verse_data in shabad_data['verses']:
-                            # Get Gurmukhi text
-                            gurmukhi = str(verse_data.get('verse', '')).strip()
-                            
-                            # Get English transliteration
-                            transliteration = ""
-                            if 'transliteration' in verse_data:
-                                if isinstance(verse_data['transliteration'], dict):
-                                    transliteration = str(verse_data['transliteration'].get('en', '')).strip()
-                                else:
-                                    transliteration = str(verse_data['transliteration']).strip()
-                            
-                            # Get English translation
-                            translation = ""
-                            if 'steek' in verse_data and 'en' in verse_data['steek']:
-                                translation = str(verse_data['steek']['en'].get('bdb', '')).strip()
-                            
-                            if gurmukhi and transliteration and translation:
-                                self.current_ang_verses.append({
-                                    'gurmukhi': gurmukhi,
-                                    'transliteration': transliteration,
-                                    'translation': translation
-                                })
-                except Exception as e:
-                    logging.error(f"Error processing verse: {str(e)}")
-                    continue
-            
-            if not self.current_ang_verses:
-                raise Exception(f"No valid verses found in ang {self.current_ang}")
+            self.update_widget('ang_label', self.page_title())
+            
+            self.current_ang_verses = verses
             
             # Reset verse index and display first verse
             self.current_verse_index = 0
             self.display_current_verse()
             
         except Exception as e:
-            logging.error(f"Error loading ang {self.current_ang}: {str(e)}")
-            messagebox.showerror("Error", f"Failed to load ang {self.current_ang}: {str(e)}")
+            logging.error(f"Error loading {self.page_title()}: {str(e)}")
+            messagebox.showerror("Error", f"Failed to load {self.page_title()}: {str(e)}")
+            
+    def page_title(self):
+        if self.current_source == 'G':
+            return f"Ang {self.current_ang}"
+        return f"{SOURCES[self.current_source][0]} - Page {self.current_ang}"
+        
+    def show_page(self, source_id, page_no, verses):
+        """Move the viewer to a page whose verses have already been fetched"""
+        self.total_angs = self.corpus.page_count(source_id)
+        self.current_source = source_id
+        self.current_ang = page_no
+        self.update_widget('ang_label', self.page_title())
+        self.current_ang_verses = verses
+        self.current_verse_index = 0
+        self.display_current_verse()
+        
+    def switch_source(self, source_id):
+        self.on_user_activity()
+        
+        try:
+            started = time.monotonic()
+            # Fetch first so a failure leaves the current source in place
+            verses = self.corpus.page(source_id, 1)
+            self.show_page(source_id, 1, verses)
+            logging.info(f"Switched to {SOURCES[source_id][0]} in {time.monotonic() - started:.2f}s")
+        except Exception as e:
+            logging.error(f"Error switching to source {source_id}: {str(e)}")
+            messagebox.showerror("Error", f"Failed to switch source: {str(e)}")
             
     def display_current_verse(self):
         try:
@@ -542,48 +1101,155 @@ class GurbaniViewer:
                 
                 # Update Gurmukhi
                 gurmukhi_text = verse.get('gurmukhi', '')
-                self.gurmukhi_label.config(text=str(gurmukhi_text).strip())
+                self.update_widget('gurmukhi_label', str(gurmukhi_text).strip())
                 
                 # Update transliteration
                 transliteration_text = verse.get('transliteration', '')
-                self.transliteration_label.config(text=str(transliteration_text).strip())
+                self.update_widget('transliteration_label', str(transliteration_text).strip())
                 
                 # Update translation
                 translation_text = verse.get('translation', '')
-                self.translation_label.config(text=str(translation_text).strip())
+                self.update_widget('translation_label', str(translation_text).strip())
                 
                 # Update line counter
-                self.verse_counter.config(
-                    text=f"Line {self.current_verse_index + 1} of {len(self.current_ang_verses)}"
+                self.update_widget(
+                    'verse_counter',
+                    f"Line {self.current_verse_index + 1} of {len(self.current_ang_verses)}"
                 )
                 
                 # Update progress bar
-                progress = (self.current_verse_index + 1) / len(self.current_ang_verses) * 100
-                self.progress_var.set(progress)
+                if not self.low_power:
+                    progress = (self.current_verse_index + 1) / len(self.current_ang_verses) * 100
+                    self.update_widget('progress_var', progress)
                 
-                # Schedule next verse display if not paused
-                if not self.is_paused:
+                # Schedule next verse display if not paused or blanked
+                if not self.is_paused and not self.is_blanked:
                     if self.auto_switch_timer:
                         self.root.after_cancel(self.auto_switch_timer)
-                    self.auto_switch_timer = self.root.after(5000, self.next_verse)
+                    self.auto_switch_timer = self.schedule(5000, self.next_verse)
                 
         except Exception as e:
             logging.error(f"Error displaying verse: {str(e)}")
             messagebox.showerror("Error", f"Failed to display verse: {str(e)}")
             
+    def update_widget(self, name, value):
+        """Set a widget's text; low-power mode skips widgets that did not change"""
+        if self.low_power:
+            if self.shown_values.get(name) == value:
+                return
+            self.shown_values[name] = value
+        
+        widget = getattr(self, name)
+        if isinstance(widget, tk.Variable):
+            widget.set(value)
+        else:
+            widget.config(text=value)
+            
+    def schedule(self, delay, callback):
+        """Schedule a timer callback, counting each run as one wakeup"""
+        def wakeup():
+            self.power.wakeup()
+            if self.power.report_due():
+                self.power.report()
+            callback()
+        return self.root.after(delay, wakeup)
+        
+    def check_blank_settings(self):
+        if not self.blank_schedule:
+            return
+        try:
+            start, end = self.blank_schedule.split('-')
+            in_time_window(start, end, datetime.now())
+            if self.blank_mode not in ('blank', 'dim'):
+                raise ValueError(f"unknown blank mode {self.blank_mode!r}")
+        except ValueError as e:
+            logging.error(
+                f"Invalid blank schedule {self.blank_schedule!r} ({str(e)}), "
+                f"display blanking disabled"
+            )
+            self.blank_schedule = None
+            
+    def housekeeping(self):
+        try:
+            self.check_blank_schedule()
+        except Exception as e:
+            logging.error(f"Error in housekeeping: {str(e)}")
+        finally:
+            self.housekeeping_timer = self.schedule(HOUSEKEEPING_INTERVAL, self.housekeeping)
+            
+    def check_blank_schedule(self, now=None):
+        start, end = self.blank_schedule.split('-')
+        in_window = in_time_window(start, end, now or datetime.now())
+        
+        # A program counts as running until it has gone unattended for a while
+        idle = time.monotonic() - self.last_activity >= BLANK_IDLE_TIMEOUT
+        
+        if in_window and idle:
+            self.blank_display()
+        elif self.is_blanked:
+            self.wake_display()
+            
+    def blank_display(self):
+        if self.is_blanked:
+            return
+        logging.info(f"No activity for {BLANK_IDLE_TIMEOUT // 60} minutes, {self.blank_mode} display")
+        self.is_blanked = True
+        
+        # Stop the auto-switch tick while idle
+        if self.auto_switch_timer:
+            self.root.after_cancel(self.auto_switch_timer)
+            self.auto_switch_timer = None
+        
+        if self.blank_mode == 'dim':
+            self.dim_display(True)
+        else:
+            self.main_frame.pack_forget()
+        
+    def wake_display(self):
+        if not self.is_blanked:
+            return
+        logging.info("Waking display")
+        self.is_blanked = False
+        
+        if self.blank_mode == 'dim':
+            self.dim_display(False)
+        else:
+            self.main_frame.pack(expand=True, fill=tk.BOTH, padx=40, pady=40)
+        self.display_current_verse()
+        
+    def on_user_activity(self, event=None):
+        # Choosing a bani or source, or any key or click, counts as activity
+        self.last_activity = time.monotonic()
+        self.wake_display()
+        
+    def dim_display(self, dimmed):
+        style = ttk.Style()
+        for name in ('Header.TLabel', 'Gurmukhi.TLabel', 'Transliteration.TLabel', 'Translation.TLabel'):
+            style.configure(name, foreground='#404040' if dimmed else '#ffffff')
+        
+        # Buttons have bright backgrounds, so dim them as well
+        buttons = self.menu_buttons + [self.prev_button, self.pause_button, self.next_button]
+        for button in buttons:
+            if dimmed:
+                self.button_colors[button] = (button.cget('bg'), button.cget('fg'))
+                button.config(bg='#1a1a1a', fg='#404040')
+            elif button in self.button_colors:
+                bg, fg = self.button_colors.pop(button)
+                button.config(bg=bg, fg=fg)
+            
     def start_auto_switch(self):
         if not self.is_paused:
-            self.auto_switch_timer = self.root.after(5000, self.next_verse)
+            self.auto_switch_timer = self.schedule(5000, self.next_verse)
             
     def toggle_pause(self):
         self.is_paused = not self.is_paused
         if self.is_paused:
-            self.pause_button.config(text="▶️ Resume")
+            self.pause_button.config(text=self.button_text("▶️", "Resume"))
             if self.auto_switch_timer:
                 self.root.after_cancel(self.auto_switch_timer)
                 self.auto_switch_timer = None
         else:
-            self.pause_button.config(text="⏸️ Pause")
+            self.pause_button.config(text=self.button_text("⏸️", "Pause"))
             self.display_current_verse()
         
     def previous_verse(self):
@@ -615,6 +1281,11 @@ class GurbaniViewer:
         try:
             if self.auto_switch_timer:
                 self.root.after_cancel(self.auto_switch_timer)
+            self.hukamnama.cancel()
+            if self.housekeeping_timer:
+                self.root.after_cancel(self.housekeeping_timer)
+            self.power.report()
+            self.corpus.close()
             self.root.destroy()
             sys.exit(0)
         except Exception as e:
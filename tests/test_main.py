@@ -0,0 +1,325 @@
+import json
+import os
+import sys
+import time
+from datetime import date, datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import main
+from main import (
+    CorpusStore, GurbaniViewer, LocalSource, LockedSource, HukamnamaScheduler,
+    PowerMonitor, fetch_page_verses, in_time_window, seconds_until
+)
+
+SHABAD = {
+    'shabad_id': 1,
+    'ang': 696,
+    'verses': [{
+        'verse': 'ਧਨਾਸਰੀ ਮਹਲਾ ੪ ॥',
+        'transliteration': {'en': 'dhanaasaree mahalaa 4 ||'},
+        'steek': {'en': {'bdb': 'Dhanaasaree, Fourth Mehl:'}}
+    }]
+}
+
+def make_source(tmp_path, day):
+    path = tmp_path / 'source.json'
+    path.write_text(json.dumps({
+        'shabads': {'1': SHABAD},
+        'hukamnamas': {day.isoformat(): {'hukam': [SHABAD]}}
+    }))
+    return LocalSource(str(path))
+
+def test_seconds_until():
+    """Test that clock times roll over to the next day once passed"""
+    now = datetime(2025, 5, 2, 3, 30)
+    assert seconds_until("04:00", now) == 30 * 60
+    assert seconds_until("03:30", now) == 24 * 60 * 60
+
+def test_hukamnama_served_from_memory(tmp_path):
+    """Test that a preloaded Hukamnama is served without touching the source"""
+    today = date(2025, 5, 2)
+    scheduler = HukamnamaScheduler(None, make_source(tmp_path, today))
+    
+    assert scheduler.preload(today)['ang'] == 696
+    scheduler.source = None
+    
+    entry = scheduler.take(today)
+    assert entry['verses'][0]['translation'] == 'Dhanaasaree, Fourth Mehl:'
+    assert scheduler.last_served_from_memory is True
+    assert scheduler.last_lead_time >= 0
+
+def test_stale_hukamnama_not_served(tmp_path):
+    """Test that yesterday's preload is not served as today's Hukamnama"""
+    today = date(2025, 5, 2)
+    scheduler = HukamnamaScheduler(None, make_source(tmp_path, today))
+    scheduler.preload(today)
+    
+    assert scheduler.take(date(2025, 5, 3)) is None
+    assert scheduler.last_served_from_memory is False
+
+class FakeRoot:
+    def __init__(self):
+        self.scheduled = []
+        
+    def after(self, delay, callback):
+        self.scheduled.append((delay, callback))
+        return len(self.scheduled)
+        
+    def after_cancel(self, timer):
+        pass
+
+def test_live_fetch_not_counted_as_preload(tmp_path):
+    """Test that a Hukamnama fetched at program time is not served as a preload"""
+    today = date(2025, 5, 2)
+    scheduler = HukamnamaScheduler(None, make_source(tmp_path, today))
+    
+    assert scheduler.take(today) is None
+    assert scheduler.fetch_live(today)['ang'] == 696
+    assert scheduler.take(today) is None
+    assert scheduler.last_served_from_memory is False
+
+def test_boot_preload_rearms_daily(tmp_path):
+    """Test that boot mode preloads at startup and schedules a daily refresh"""
+    root = FakeRoot()
+    scheduler = HukamnamaScheduler(root, make_source(tmp_path, date.today()))
+    scheduler.preload_async = lambda: scheduler.preload()
+    
+    scheduler.start()
+    assert scheduler.take() is not None
+    assert len(root.scheduled) == 1
+    assert 0 < root.scheduled[0][0] <= 24 * 60 * 60 * 1000
+    
+    root.scheduled[0][1]()
+    assert len(root.scheduled) == 2
+
+def test_locked_source_passes_calls_through(tmp_path):
+    """Test that the locking wrapper returns the wrapped source's data"""
+    today = date(2025, 5, 2)
+    source = LockedSource(make_source(tmp_path, today))
+    
+    assert source.shabad(1) == SHABAD
+    assert source.hukamnama(2025, 5, 2) == {'hukam': [SHABAD]}
+    assert not source.lock.locked()
+
+def test_in_time_window():
+    """Test blank windows, including ones that wrap past midnight"""
+    assert in_time_window("22:00", "05:00", datetime(2025, 5, 2, 23, 0))
+    assert in_time_window("22:00", "05:00", datetime(2025, 5, 2, 4, 59))
+    assert not in_time_window("22:00", "05:00", datetime(2025, 5, 2, 12, 0))
+    assert in_time_window("13:00", "14:00", datetime(2025, 5, 2, 13, 30))
+
+class FakeLabel:
+    def __init__(self):
+        self.configs = 0
+        
+    def config(self, text):
+        self.configs += 1
+
+def make_viewer(low_power):
+    viewer = GurbaniViewer.__new__(GurbaniViewer)
+    viewer.root = FakeRoot()
+    viewer.low_power = low_power
+    viewer.shown_values = {}
+    viewer.power = PowerMonitor('low-power' if low_power else 'standard')
+    viewer.is_paused = False
+    viewer.is_blanked = False
+    viewer.auto_switch_timer = None
+    viewer.current_ang = 1
+    viewer.total_angs = 1430
+    viewer.current_verse_index = 0
+    viewer.current_ang_verses = [
+        {'gurmukhi': f'g{i}', 'transliteration': f't{i}', 'translation': f'e{i}'}
+        for i in range(10)
+    ]
+    for name in ('gurmukhi_label', 'transliteration_label', 'translation_label',
+                 'verse_counter', 'progress_var'):
+        setattr(viewer, name, FakeLabel())
+    return viewer
+
+def run_ticks(viewer, ticks):
+    viewer.display_current_verse()
+    for _ in range(ticks):
+        viewer.root.scheduled[-1][1]()
+    return sum(viewer.__dict__[name].configs for name in (
+        'gurmukhi_label', 'transliteration_label', 'translation_label',
+        'verse_counter', 'progress_var'))
+
+def test_low_power_counts_wakeups_like_standard_mode():
+    """Test that both modes count one wakeup per verse tick"""
+    standard = make_viewer(False)
+    low_power = make_viewer(True)
+    run_ticks(standard, 5)
+    run_ticks(low_power, 5)
+    
+    assert standard.power.wakeups == low_power.power.wakeups == 5
+
+def test_low_power_updates_fewer_widgets():
+    """Test that the kiosk layout reconfigures fewer widgets per tick"""
+    standard_updates = run_ticks(make_viewer(False), 5)
+    low_power_updates = run_ticks(make_viewer(True), 5)
+    
+    # Every line changes all three texts and the counter; only standard
+    # mode also has a progress bar
+    assert standard_updates == 6 * 5
+    assert low_power_updates == 6 * 4
+
+class FakeFrame:
+    def __init__(self):
+        self.packed = True
+        
+    def pack(self, **kwargs):
+        self.packed = True
+        
+    def pack_forget(self):
+        self.packed = False
+
+def make_blanking_viewer():
+    viewer = make_viewer(True)
+    viewer.blank_schedule = '22:00-05:00'
+    viewer.blank_mode = 'blank'
+    viewer.main_frame = FakeFrame()
+    viewer.last_activity = time.monotonic()
+    viewer.display_current_verse()
+    return viewer
+
+def test_blank_schedule_keeps_recent_program_on():
+    """Test that a bani chosen just before the window opens keeps playing"""
+    viewer = make_blanking_viewer()
+    viewer.check_blank_schedule(datetime(2025, 5, 2, 22, 0))
+    
+    assert not viewer.is_blanked
+    assert viewer.main_frame.packed
+
+def test_blank_and_wake_transitions():
+    """Test blanking when idle in the window, and waking on activity or window end"""
+    viewer = make_blanking_viewer()
+    viewer.last_activity -= 31 * 60
+    
+    viewer.check_blank_schedule(datetime(2025, 5, 2, 23, 0))
+    assert viewer.is_blanked
+    assert not viewer.main_frame.packed
+    assert viewer.auto_switch_timer is None
+    
+    # A touch wakes the display, which blanks again after another idle period
+    viewer.on_user_activity()
+    assert not viewer.is_blanked
+    assert viewer.main_frame.packed
+    assert viewer.auto_switch_timer is not None
+    viewer.check_blank_schedule(datetime(2025, 5, 2, 23, 5))
+    assert not viewer.is_blanked
+    viewer.last_activity -= 31 * 60
+    viewer.check_blank_schedule(datetime(2025, 5, 2, 23, 40))
+    assert viewer.is_blanked
+    
+    # Leaving the window wakes it too
+    viewer.check_blank_schedule(datetime(2025, 5, 3, 5, 0))
+    assert not viewer.is_blanked
+
+def test_invalid_blank_settings_disable_blanking():
+    """Test that a bad schedule or mode is rejected once at startup"""
+    viewer = make_viewer(True)
+    for schedule, mode in (('22:00', 'blank'), ('22:00-25:00', 'blank'), ('22:00-05:00', 'dimm')):
+        viewer.blank_schedule = schedule
+        viewer.blank_mode = mode
+        viewer.check_blank_settings()
+        assert viewer.blank_schedule is None
+    
+    viewer.blank_schedule = '22:00-05:00'
+    viewer.blank_mode = 'dim'
+    viewer.check_blank_settings()
+    assert viewer.blank_schedule == '22:00-05:00'
+
+def test_corpus_store_opens_shards_lazily(tmp_path):
+    """Test that each source gets its own shard, opened on first use"""
+    path = tmp_path / 'source.json'
+    path.write_text(json.dumps({
+        'angs': {'D': {'1': {'page': [{'shabad_id': 1}]}}},
+        'shabads': {'1': SHABAD}
+    }))
+    store = CorpusStore(str(tmp_path / 'corpus'), LocalSource(str(path)))
+    assert os.listdir(tmp_path / 'corpus') == []
+    
+    assert store.page_count('D') == 1428
+    assert store.page('D', 1)[0]['gurmukhi'] == 'ਧਨਾਸਰੀ ਮਹਲਾ ੪ ॥'
+    assert sorted(os.listdir(tmp_path / 'corpus')) == ['D.db']
+    
+    # Stored pages are served without the data source
+    store.source = None
+    store.close_idle(now=store.shards['D'].last_used + store.idle_timeout + 1)
+    assert store.shards['D'].conn is None
+    assert len(store.page('D', 1)) == 1
+    store.close()
+
+SHABAD_2 = {
+    'shabad_id': 2,
+    'ang': 696,
+    'verses': [{
+        'verse': 'ਹਰਿ ਹਰਿ ਬੂੰਦ ਭਏ ਹਰਿ ਸੁਆਮੀ ॥',
+        'transliteration': {'en': 'har har boo(n)dh bhe har suaamee ||'},
+        'steek': {'en': {'bdb': 'The Name of the Lord, Har, Har, is the rain-drop.'}}
+    }]
+}
+
+class FlakySource(LocalSource):
+    def __init__(self, path):
+        super().__init__(path)
+        self.failures = 1
+        self.calls = 0
+        
+    def shabad(self, shabad_id):
+        self.calls += 1
+        if self.calls == 2 and self.failures:
+            self.failures -= 1
+            raise ConnectionError("network down")
+        return super().shabad(shabad_id)
+
+def write_two_shabad_source(tmp_path):
+    path = tmp_path / 'source.json'
+    path.write_text(json.dumps({
+        'angs': {'G': {'1': {'page': [
+            {'shabad_id': 1}, {'shabad_id': 1}, {'shabad_id': 2}
+        ]}}},
+        'shabads': {'1': SHABAD, '2': SHABAD_2}
+    }))
+    return str(path)
+
+def test_fetch_page_verses_shows_each_shabad_once(tmp_path):
+    """Test that lines sharing a shabad do not repeat its verses"""
+    verses, complete = fetch_page_verses(LocalSource(write_two_shabad_source(tmp_path)), 1)
+    
+    assert complete
+    assert [verse['gurmukhi'] for verse in verses] == [
+        SHABAD['verses'][0]['verse'], SHABAD_2['verses'][0]['verse']
+    ]
+
+def test_corpus_store_does_not_keep_incomplete_pages(tmp_path):
+    """Test that a page with a failed shabad fetch is fetched again later"""
+    store = CorpusStore(str(tmp_path / 'corpus'), FlakySource(write_two_shabad_source(tmp_path)))
+    
+    assert len(store.page('G', 1)) == 1
+    assert store.shards['G'].page(1) is None
+    assert len(store.page('G', 1)) == 2
+    assert len(store.shards['G'].page(1)) == 2
+    store.close()
+
+class FailingSource:
+    def angs(self, ang_no, source_id='G'):
+        raise ConnectionError("network down")
+
+def test_failed_switch_keeps_current_source(tmp_path, monkeypatch):
+    """Test that a source or bani whose first page fails leaves the viewer as it was"""
+    monkeypatch.setattr(main.messagebox, 'showerror', lambda *args: None)
+    viewer = make_viewer(False)
+    viewer.last_activity = 0
+    viewer.current_source = 'D'
+    viewer.total_angs = 1428
+    viewer.current_ang = 5
+    viewer.bani_categories = {"Evening Nitnem": {"Kirtan Sohila": (21, 22)}}
+    viewer.corpus = CorpusStore(str(tmp_path / 'corpus'), FailingSource())
+    
+    viewer.switch_source('B')
+    viewer.load_bani("Kirtan Sohila")
+    
+    assert (viewer.current_source, viewer.total_angs, viewer.current_ang) == ('D', 1428, 5)
+    viewer.corpus.close()